@@ -10,46 +10,161 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import hashlib
 import json
+import operator
+import re
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Tuple
 import sys
 import traceback
 import os
 import tempfile
+import uuid
+import weakref
 import webbrowser
+from plotly.offline import get_plotlyjs_version
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib json module is used otherwise
+    orjson = None
+
+try:
+    import fastnumbers
+except ImportError:  # Optional speed-up; pandas handles the conversion otherwise
+    fastnumbers = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional speed-up; DataFrames are built by pandas otherwise
+    pa = None
+
+_PLOTLY_JSON_ENGINE = 'orjson' if orjson is not None else 'json'
 
 # --- Helper Functions ---
 
+def _build_dataframe(data: Any) -> pd.DataFrame:
+    """Build a DataFrame, going through Arrow for column-oriented data of flat scalars."""
+    if pa is not None and isinstance(data, dict) and data and all(isinstance(values, list) for values in data.values()):
+        try:
+            table = pa.Table.from_pydict(data)
+        except Exception:
+            # Mixed-type, ragged or out-of-int64 columns are left to pandas to handle or report
+            table = None
+        # Nested columns would come back as NumPy arrays rather than the lists pandas keeps
+        if table is not None and not any(pa.types.is_nested(field.type) for field in table.schema):
+            return table.to_pandas()
+    return pd.DataFrame(data)
+
+_DATAFRAME_CACHE_SIZE = 32
+_dataframe_cache: "OrderedDict[bytes, pd.DataFrame]" = OrderedDict()
+
+def _load_dataframe(data_json: str) -> pd.DataFrame:
+    """Parse a JSON dataset into a DataFrame, reusing recently parsed payloads.
+
+    The returned frame is shared between calls and must not be mutated;
+    callers take a copy before converting any columns.
+    """
+    key = hashlib.blake2b(data_json.encode(), digest_size=16).digest()
+    df = _dataframe_cache.get(key)
+    if df is None:
+        if orjson is not None:
+            try:
+                data = orjson.loads(data_json)
+            except orjson.JSONDecodeError:
+                # orjson rejects the NaN/Infinity tokens json.dumps writes by default;
+                # the stdlib parser accepts those and still reports malformed input
+                data = json.loads(data_json)
+        else:
+            data = json.loads(data_json)
+        df = _build_dataframe(data)
+        _dataframe_cache[key] = df
+        if len(_dataframe_cache) > _DATAFRAME_CACHE_SIZE:
+            _dataframe_cache.popitem(last=False)
+    else:
+        _dataframe_cache.move_to_end(key)
+    return df
+
+# Common string representations of missing values
+_NA_SENTINELS = frozenset(['na', 'Na', 'NA', 'n/a', 'N/A', '', 'null', 'None'])
+
 def _is_numeric_convertible(series: pd.Series, threshold: float = 0.8) -> bool:
     """Check if a series can be meaningfully converted to numeric."""
-    if series.dtype in ['int64', 'float64', 'int32', 'float32']:
+    # Covers every numeric width plus nullable and Arrow-backed numeric dtypes; bool is
+    # excluded so validation agrees with _split_columns_by_dtype
+    if series.dtype.kind in 'iufc':
         return True
     
     if series.dtype == 'object':
         # Try conversion on a sample
-        sample = series.dropna().head(100)
-        if sample.empty:
+        sample = series.dropna().head(100).to_numpy()
+        if sample.size == 0:
             return False
             
         try:
-            # Handle common missing value representations
-            sample_clean = sample.replace(['na', 'Na', 'NA', 'n/a', 'N/A', ''], pd.NA)
-            converted = pd.to_numeric(sample_clean, errors='coerce')
-            success_rate = (converted.notna().sum() / len(sample_clean.dropna()))
-            return success_rate >= threshold
+            # Missing value representations don't count towards the success rate
+            present = np.fromiter((value not in _NA_SENTINELS for value in sample), dtype=bool, count=sample.size)
+            candidates = sample[present]
+            if candidates.size == 0:
+                return False
+            converted = pd.to_numeric(candidates, errors='coerce')
+            return pd.notna(converted).mean() >= threshold
         except:
             return False
     
     return False
 
+# Memoized _is_numeric_convertible results per DataFrame, keyed by id() and
+# dropped when the frame is garbage collected
+_numeric_column_cache: Dict[int, Dict[Tuple[Any, float], bool]] = {}
+
+def _is_numeric_column(df: pd.DataFrame, col: Any, threshold: float = 0.8) -> bool:
+    """Memoized _is_numeric_convertible for a column of a frame that is not modified in place."""
+    results = _numeric_column_cache.get(id(df))
+    if results is None:
+        results = _numeric_column_cache[id(df)] = {}
+        weakref.finalize(df, _numeric_column_cache.pop, id(df), None)
+    key = (col, threshold)
+    if key not in results:
+        results[key] = _is_numeric_convertible(df[col], threshold)
+    return results[key]
+
 def _clean_numeric_data(series: pd.Series) -> pd.Series:
     """Clean and convert series to numeric, handling missing values."""
-    # Replace common missing value representations
-    cleaned = series.replace(['na', 'Na', 'NA', 'n/a', 'N/A', '', 'null', 'None'], pd.NA)
-    return pd.to_numeric(cleaned, errors='coerce')
+    if fastnumbers is not None and series.dtype == 'object':
+        # One pass over the raw values; missing value strings fail to parse and become NaN
+        values = fastnumbers.try_array(series.to_numpy(), dtype=np.float64, on_fail=np.nan, on_type_error=np.nan)
+        return pd.Series(values, index=series.index, name=series.name)
+
+    # Missing value strings such as 'na' or 'None' are not numeric, so coercion turns them into NaN
+    return pd.to_numeric(series, errors='coerce')
+
+def _compact_floats(values):
+    """Narrow float64 data to float32 when every value survives the round trip."""
+    if values.dtype == np.float64:
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed, values, equal_nan=True):
+            return narrowed
+    return values
+
+def _to_numeric_compact(series: pd.Series) -> pd.Series:
+    """Clean and convert series to numeric, using float32 where it is lossless."""
+    return _compact_floats(_clean_numeric_data(series))
+
+def _split_columns_by_dtype(df: pd.DataFrame) -> Tuple[List[Any], List[Any]]:
+    """Partition columns into (numeric, categorical) lists in a single pass over the dtypes."""
+    numeric_cols, categorical_cols = [], []
+    for col, dtype in df.dtypes.items():
+        if dtype.kind in 'iufc':
+            numeric_cols.append(col)
+        elif dtype == object or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            categorical_cols.append(col)
+    return numeric_cols, categorical_cols
 
 # --- Handlers for Special Chart Types ---
 
@@ -83,15 +198,8 @@ def _handle_indicator(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
 
 def _handle_surface(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
     """Creates a surface plot, pivoting data as needed."""
-    # Debug: Print exactly what we received
-    print(f"DEBUG: Surface handler received mappings: {mappings}", file=sys.stderr)
-    print(f"DEBUG: DataFrame columns: {list(df.columns)}", file=sys.stderr)
-    print(f"DEBUG: DataFrame shape: {df.shape}", file=sys.stderr)
-    
     x_col, y_col, z_col = mappings.get('x'), mappings.get('y'), mappings.get('z')
     
-    print(f"DEBUG: x_col={x_col}, y_col={y_col}, z_col={z_col}", file=sys.stderr)
-    
     if not (x_col and y_col and z_col):
         missing = []
         if not x_col: missing.append('x')
@@ -105,13 +213,12 @@ def _handle_surface(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
             raise ValueError(f"Column '{col_val}' for '{col_name}' not found in data. Available: {list(df.columns)}")
 
     try:
-        # Clean data
-        df_clean = df.copy()
-        
-        # Clean numeric data
-        df_clean[x_col] = pd.to_numeric(df_clean[x_col], errors='coerce')
-        df_clean[y_col] = pd.to_numeric(df_clean[y_col], errors='coerce')
-        df_clean[z_col] = pd.to_numeric(df_clean[z_col], errors='coerce')
+        # Clean numeric data, keeping only the plotted columns
+        df_clean = pd.DataFrame({
+            x_col: pd.to_numeric(df[x_col], errors='coerce'),
+            y_col: pd.to_numeric(df[y_col], errors='coerce'),
+            z_col: pd.to_numeric(df[z_col], errors='coerce'),
+        })
         
         # Remove rows with NaN values
         df_clean = df_clean.dropna(subset=[x_col, y_col, z_col])
@@ -119,26 +226,21 @@ def _handle_surface(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
         if df_clean.empty:
             raise ValueError("No valid data after removing NaN values")
         
-        print(f"DEBUG: Clean data shape: {df_clean.shape}", file=sys.stderr)
-        
-        # Create pivot table
-        try:
-            pivot_df = df_clean.pivot_table(
-                index=y_col, 
-                columns=x_col, 
-                values=z_col, 
-                aggfunc='mean'  # Handle duplicates by averaging
-            )
-        except Exception as e:
-            raise ValueError(f"Failed to pivot data for surface plot: {e}")
-        
-        print(f"DEBUG: Pivot table shape: {pivot_df.shape}", file=sys.stderr)
+        # Scatter z onto a dense (y, x) grid, averaging duplicate points
+        x_codes, x_values = pd.factorize(df_clean[x_col], sort=True)
+        y_codes, y_values = pd.factorize(df_clean[y_col], sort=True)
+        grid_shape = (len(y_values), len(x_values))
+        cells = y_codes * grid_shape[1] + x_codes
+        sums = np.bincount(cells, weights=df_clean[z_col].to_numpy(dtype=np.float64), minlength=grid_shape[0] * grid_shape[1])
+        counts = np.bincount(cells, minlength=grid_shape[0] * grid_shape[1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_grid = (sums / counts).reshape(grid_shape)
         
         # Create surface plot
         fig = go.Figure(data=[go.Surface(
-            z=pivot_df.values,
-            x=pivot_df.columns,
-            y=pivot_df.index,
+            z=_compact_floats(z_grid),
+            x=x_values,
+            y=y_values,
             colorscale='Viridis'
         )])
         
@@ -153,22 +255,20 @@ def _handle_surface(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
             title=f"Surface Plot: {z_col} vs {x_col} and {y_col}"
         )
         
-        print("DEBUG: Surface plot created successfully", file=sys.stderr)
         return fig
         
     except Exception as e:
-        print(f"DEBUG: Surface plot error: {e}", file=sys.stderr)
         raise ValueError(f"Failed to create surface plot: {e}")
 
 def _handle_scatter_matrix(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
     """Creates a scatter matrix, ensuring the 'dimensions' parameter is a list of numeric columns."""
     # Convert potential numeric columns
-    df_clean = df.copy()
-    for col in df_clean.columns:
-        if _is_numeric_convertible(df_clean[col]):
-            df_clean[col] = _clean_numeric_data(df_clean[col])
+    df_clean = pd.DataFrame({
+        col: _clean_numeric_data(df[col]) if _is_numeric_convertible(df[col]) else df[col]
+        for col in df.columns
+    })
     
-    numeric_cols = df_clean.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols, _ = _split_columns_by_dtype(df_clean)
     if not numeric_cols:
         raise ValueError("Scatter matrix requires at least one numeric column in the data.")
 
@@ -178,7 +278,7 @@ def _handle_scatter_matrix(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Fig
 
 def _handle_parallel_categories(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
     """Creates a parallel categories plot, ensuring 'dimensions' is a list of categorical columns."""
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    _, categorical_cols = _split_columns_by_dtype(df)
     if not categorical_cols:
         raise ValueError("Parallel categories chart requires at least one categorical (string) column.")
 
@@ -199,12 +299,12 @@ def _handle_parallel_categories(df: pd.DataFrame, mappings: Dict[str, str]) -> g
 def _handle_parallel_coordinates(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
     """Creates parallel coordinates plot with numeric dimensions."""
     # Convert potential numeric columns
-    df_clean = df.copy()
-    for col in df_clean.columns:
-        if _is_numeric_convertible(df_clean[col]):
-            df_clean[col] = _clean_numeric_data(df_clean[col])
+    df_clean = pd.DataFrame({
+        col: _clean_numeric_data(df[col]) if _is_numeric_convertible(df[col]) else df[col]
+        for col in df.columns
+    })
     
-    numeric_cols = df_clean.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols, _ = _split_columns_by_dtype(df_clean)
     if not numeric_cols:
         raise ValueError("Parallel coordinates requires at least one numeric column.")
     
@@ -220,27 +320,27 @@ def _handle_hierarchical_charts(df: pd.DataFrame, mappings: Dict[str, str], char
     if not values_col:
         raise ValueError(f"{chart_type} chart requires 'values' mapping.")
     
-    # Clean the data
-    df_clean = df.copy()
-    
-    # Handle missing values and convert to numeric
-    if values_col in df_clean.columns:
-        df_clean[values_col] = _clean_numeric_data(df_clean[values_col])
-        df_clean = df_clean.dropna(subset=[values_col])
-        
-        # Ensure positive values for hierarchical charts
-        df_clean = df_clean[df_clean[values_col] > 0]
+    if values_col not in df.columns:
+        raise ValueError(f"Column '{values_col}' for 'values' not found in data.")
     
-    if df_clean.empty:
+    # Keep positive values only; one mask also drops missing values since NaN > 0 is False
+    values = _clean_numeric_data(df[values_col])
+    keep = (values > 0).to_numpy(dtype=bool, na_value=False)
+    if not keep.any():
         raise ValueError(f"No valid positive numeric data found for {chart_type} chart.")
+    values = values[keep]
     
     # If no names provided, create indices or use row indices
-    if not names_col or names_col not in df_clean.columns:
-        df_clean['_auto_names'] = [f"Item {i+1}" for i in range(len(df_clean))]
+    if names_col and names_col in df.columns:
+        names = values if names_col == values_col else df[names_col][keep]
+    else:
+        names = [f"Item {i+1}" for i in range(len(values))]
         names_col = '_auto_names'
     
-    # Aggregate data by names column (sum values for each unique name)
-    agg_df = df_clean.groupby(names_col)[values_col].sum().reset_index()
+    # Aggregate data by names column (sum values for each unique name); categorical
+    # keys let the groupby work on integer codes instead of hashing every name again
+    sums = pd.Series(values.to_numpy()).groupby(pd.Categorical(np.asarray(names)), observed=True).sum()
+    agg_df = pd.DataFrame({names_col: np.asarray(sums.index), values_col: sums.to_numpy()})
     
     # Create the chart using Plotly Express
     if chart_type == 'treemap':
@@ -262,29 +362,32 @@ def _handle_sunburst(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
     """Creates a sunburst chart with proper data handling."""
     return _handle_hierarchical_charts(df, mappings, 'sunburst')
 
+_CANDLESTICK_REQUIRED = ('x', 'open', 'high', 'low', 'close')
+_candlestick_columns = operator.itemgetter(*_CANDLESTICK_REQUIRED)
+
 def _handle_candlestick(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
     """Creates a candlestick chart."""
-    required = ['x', 'open', 'high', 'low', 'close']
-    for col in required:
+    for col in _CANDLESTICK_REQUIRED:
         if col not in mappings:
             raise ValueError(f"Candlestick chart requires '{col}' mapping.")
     
+    x_col, open_col, high_col, low_col, close_col = _candlestick_columns(mappings)
+    price_cols = (open_col, high_col, low_col, close_col)
+    
     # Clean numeric data
-    df_clean = df.copy()
-    for col in ['open', 'high', 'low', 'close']:
-        if mappings[col] in df_clean.columns:
-            df_clean[mappings[col]] = _clean_numeric_data(df_clean[mappings[col]])
+    columns = {x_col: df[x_col]}
+    columns.update((col, _to_numeric_compact(df[col])) for col in price_cols if col in df.columns)
     
-    df_clean = df_clean.dropna(subset=[mappings[col] for col in required])
+    df_clean = pd.DataFrame(columns).dropna(subset=[x_col, *price_cols])
     if df_clean.empty:
         raise ValueError("No valid data for candlestick chart.")
     
     return go.Figure(data=[go.Candlestick(
-        x=df_clean[mappings['x']],
-        open=df_clean[mappings['open']],
-        high=df_clean[mappings['high']],
-        low=df_clean[mappings['low']],
-        close=df_clean[mappings['close']]
+        x=df_clean[x_col],
+        open=df_clean[open_col],
+        high=df_clean[high_col],
+        low=df_clean[low_col],
+        close=df_clean[close_col]
     )])
 
 def _handle_waterfall(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
@@ -297,9 +400,10 @@ def _handle_waterfall(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
         raise ValueError("Waterfall chart requires 'x' and 'y' mappings.")
     
     # Clean the y data
-    df_clean = df.copy()
-    df_clean[y_col] = _clean_numeric_data(df_clean[y_col])
-    df_clean = df_clean.dropna(subset=[y_col])
+    columns = {x_col: df[x_col], y_col: _to_numeric_compact(df[y_col])}
+    if measure_col:
+        columns[measure_col] = df[measure_col]
+    df_clean = pd.DataFrame(columns).dropna(subset=[y_col])
     
     if df_clean.empty:
         raise ValueError("No valid data for waterfall chart.")
@@ -323,23 +427,27 @@ def _handle_sankey(df: pd.DataFrame, mappings: Dict[str, str]) -> go.Figure:
         raise ValueError("Sankey chart requires 'source', 'target', and 'value' mappings.")
     
     # Clean the data
-    df_clean = df.copy()
-    df_clean[value_col] = _clean_numeric_data(df_clean[value_col])
+    df_clean = pd.DataFrame({
+        source_col: df[source_col],
+        target_col: df[target_col],
+        value_col: _to_numeric_compact(df[value_col]),
+    })
     df_clean = df_clean.dropna(subset=[source_col, target_col, value_col])
     df_clean = df_clean[df_clean[value_col] > 0]
     
     if df_clean.empty:
         raise ValueError("No valid data for sankey chart.")
     
-    # Get unique labels
-    labels = pd.concat([df_clean[source_col], df_clean[target_col]]).unique().tolist()
-    label_map = {label: i for i, label in enumerate(labels)}
+    # Encode sources and targets against one shared label table in a single pass
+    endpoints = np.concatenate([df_clean[source_col].to_numpy(), df_clean[target_col].to_numpy()])
+    codes, labels = pd.factorize(endpoints)
+    source_codes, target_codes = codes[:len(df_clean)], codes[len(df_clean):]
     
     return go.Figure(data=[go.Sankey(
-        node=dict(label=labels),
+        node=dict(label=labels.tolist()),
         link=dict(
-            source=[label_map[s] for s in df_clean[source_col]],
-            target=[label_map[t] for t in df_clean[target_col]],
+            source=source_codes,
+            target=target_codes,
             value=df_clean[value_col]
         )
     )])
@@ -359,13 +467,62 @@ SPECIAL_CHART_HANDLERS: Dict[str, Callable[[pd.DataFrame, Dict[str, str]], go.Fi
     'sunburst': _handle_sunburst,
 }
 
+# Plotly Express plotting functions, resolved once at import time
+_PX_CHART_FUNCTIONS: Dict[str, Callable[..., go.Figure]] = {
+    attr: getattr(px, attr) for attr in dir(px) if not attr.startswith('_') and callable(getattr(px, attr))
+}
+
+_CHART_ALIASES: Dict[str, str] = {
+    'doughnut': 'pie',
+    'bubble': 'scatter'
+}
+
+_AVAILABLE_CHARTS: Tuple[str, ...] = tuple(sorted(set(_PX_CHART_FUNCTIONS) | set(SPECIAL_CHART_HANDLERS) | set(_CHART_ALIASES)))
+
 # --- Core Logic & Public API ---
 
+# Splits error messages into fixed-width 80 character chunks
+_ERROR_WRAP_RE = re.compile(r'.{1,80}', re.DOTALL)
+
+# Escapes applied to serialized figures so they can be embedded in a <script> block
+_JSON_HTML_ESCAPES = (
+    (b'<', b'\\u003c'),
+    (b'>', b'\\u003e'),
+    (b'/', b'\\u002f'),
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+_HTML_PAGE_HEAD = """<!doctype html>
+<html>
+<head>
+    <meta charset="utf-8" />
+    <script charset="utf-8" src="https://cdn.plot.ly/plotly-{plotlyjs_version}.min.js"></script>
+</head>
+<body>
+    <div id="{div_id}" class="plotly-graph-div" style="height:{height}px; width:{width}px;"></div>
+    <script>
+        var figure = """
+
+_HTML_PAGE_TAIL = """;
+        Plotly.newPlot("{div_id}", figure.data, figure.layout, {config}).then(function () {{
+            // Animated charts carry their frames alongside data and layout, as in plotly's write_html
+            if (figure.frames && figure.frames.length) {{
+                return Plotly.addFrames("{div_id}", figure.frames).then(function () {{
+                    Plotly.animate("{div_id}", null);
+                }});
+            }}
+        }});
+    </script>
+</body>
+</html>
+"""
+
 def _create_error_figure(error_message: str) -> go.Figure:
     """Creates a visually clear error message figure."""
     fig = go.Figure()
     # Break the error message into lines for better readability
-    wrapped_message = "<br>".join(error_message[i:i+80] for i in range(0, len(error_message), 80))
+    wrapped_message = "<br>".join(_ERROR_WRAP_RE.findall(error_message))
     fig.add_annotation(
         text=f"<b>Chart Rendering Error:</b><br>{wrapped_message}",
         xref="paper", yref="paper",
@@ -386,6 +543,20 @@ def _create_error_figure(error_message: str) -> go.Figure:
     )
     return fig
 
+def _figure_to_json_bytes(fig: go.Figure) -> bytes:
+    """Serializes a figure to UTF-8 JSON that is safe to embed in an HTML page."""
+    if orjson is None:
+        return fig.to_json(engine='json').encode()
+    try:
+        payload = orjson.dumps(fig.to_plotly_json(), option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # Values orjson can't handle natively go through Plotly's cleaning step
+        return fig.to_json(engine='orjson').encode()
+    for unsafe, escaped in _JSON_HTML_ESCAPES:
+        if unsafe in payload:
+            payload = payload.replace(unsafe, escaped)
+    return payload
+
 def _get_base_layout(chart_name: str) -> go.Layout:
     """Returns a consistent base layout for all charts."""
     return go.Layout(
@@ -404,26 +575,23 @@ def _get_base_layout(chart_name: str) -> go.Layout:
 
 def _create_figure(chart_name: str, data_json: str, mappings: Dict[str, str]) -> go.Figure:
     """Core private function to prepare data and create a Plotly Figure object."""
-    print(f"DEBUG: _create_figure called with chart_name='{chart_name}'", file=sys.stderr)
-    print(f"DEBUG: mappings={mappings}", file=sys.stderr)
-    
-    data = json.loads(data_json)
-    df = pd.DataFrame(data)
+    base_df = _load_dataframe(data_json)
+    # Columns are only ever replaced, never written in place, so a shallow
+    # copy is enough to keep the cached frame intact
+    df = base_df.copy(deep=False)
     if df.empty:
         raise ValueError("Dataset is empty")
-    
-    print(f"DEBUG: DataFrame shape: {df.shape}", file=sys.stderr)
-    print(f"DEBUG: DataFrame columns: {list(df.columns)}", file=sys.stderr)
 
     # Smart conversion based on chart requirements and data suitability
     for arg_name, column_name in mappings.items():
         if isinstance(column_name, str) and column_name in df.columns:
             col_data = df[column_name]
             
-            # For arguments that should be numeric, try conversion if it makes sense
+            # For arguments that should be numeric, try conversion if it makes sense.
+            # Conversions run one column at a time: both pd.to_numeric and fastnumbers
+            # hold the GIL while walking object arrays, so threads would not overlap them.
             if arg_name in ['x', 'y', 'z', 'size', 'values', 'value', 'r', 'theta', 'open', 'high', 'low', 'close'] and col_data.dtype == 'object':
-                if _is_numeric_convertible(col_data):
-                    print(f"DEBUG: Converting column '{column_name}' to numeric", file=sys.stderr)
+                if _is_numeric_column(base_df, column_name):
                     df[column_name] = _clean_numeric_data(col_data)
             
             # Special handling for y-axis in bar charts - keep categorical data as strings
@@ -440,27 +608,17 @@ def _create_figure(chart_name: str, data_json: str, mappings: Dict[str, str]) ->
         if isinstance(column, str) and column not in df.columns:
              raise ValueError(f"Column '{column}' not found. Available: {list(df.columns)}")
 
-    print(f"DEBUG: Checking if '{chart_name}' is in SPECIAL_CHART_HANDLERS", file=sys.stderr)
-    print(f"DEBUG: SPECIAL_CHART_HANDLERS keys: {list(SPECIAL_CHART_HANDLERS.keys())}", file=sys.stderr)
-    
     if chart_name in SPECIAL_CHART_HANDLERS:
-        print(f"DEBUG: Found special handler for '{chart_name}'", file=sys.stderr)
         handler = SPECIAL_CHART_HANDLERS[chart_name]
-        print(f"DEBUG: About to call handler: {handler.__name__}", file=sys.stderr)
         return handler(df, mappings)
     else:
-        print(f"DEBUG: Using standard plotly express for '{chart_name}'", file=sys.stderr)
         # Handle chart name aliases
-        actual_chart_name = {
-            'doughnut': 'pie', 
-            'bubble': 'scatter'
-        }.get(chart_name, chart_name)
+        actual_chart_name = _CHART_ALIASES.get(chart_name, chart_name)
         
-        plot_function = getattr(px, actual_chart_name, None)
+        plot_function = _PX_CHART_FUNCTIONS.get(actual_chart_name)
 
-        if not callable(plot_function):
-            available = [attr for attr in dir(px) if not attr.startswith('_') and callable(getattr(px, attr))]
-            raise ValueError(f"Unknown or unsupported chart type '{chart_name}'. Available in px: {available}")
+        if plot_function is None:
+            raise ValueError(f"Unknown or unsupported chart type '{chart_name}'. Available in px: {list(_PX_CHART_FUNCTIONS)}")
         
         fig = plot_function(df, **mappings)
         
@@ -469,33 +627,47 @@ def _create_figure(chart_name: str, data_json: str, mappings: Dict[str, str]) ->
         
         return fig
 
-def render_chart(chart_name: str, data_json: str, mappings: Dict[str, str]) -> str:
-    """Dynamically renders a chart, creating an error chart on failure."""
+def _render_figure(chart_name: str, data_json: str, mappings: Dict[str, str], width: int, height: int, caller: str) -> go.Figure:
+    """Creates the laid-out chart figure, or an error figure if rendering fails."""
     try:
         fig = _create_figure(chart_name, data_json, mappings)
         fig.update_layout(_get_base_layout(chart_name))
-        fig.update_layout(width=1000, height=600)
     except Exception as e:
-        print(f"Error in render_chart: {str(e)}", file=sys.stderr)
+        print(f"Error in {caller}: {str(e)}", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
         fig = _create_error_figure(str(e))
-        fig.update_layout(width=1000, height=600)
-    return fig.to_json()
+    fig.update_layout(width=width, height=height)
+    return fig
+
+def render_chart(chart_name: str, data_json: str, mappings: Dict[str, str]) -> str:
+    """Dynamically renders a chart, creating an error chart on failure."""
+    fig = _render_figure(chart_name, data_json, mappings, 1000, 600, 'render_chart')
+    return fig.to_json(engine=_PLOTLY_JSON_ENGINE)
+
+def render_chart_bytes(chart_name: str, data_json: str, mappings: Dict[str, str]) -> bytes:
+    """Like render_chart, but returns UTF-8 encoded JSON for callers that write bytes."""
+    fig = _render_figure(chart_name, data_json, mappings, 1000, 600, 'render_chart_bytes')
+    return _figure_to_json_bytes(fig)
 
 def save_chart_as_html(chart_name: str, data_json: str, mappings: Dict[str, str], output_path: str) -> str:
     """Renders a chart to HTML, creating an error chart on failure."""
-    try:
-        fig = _create_figure(chart_name, data_json, mappings)
-        fig.update_layout(_get_base_layout(chart_name))
-        fig.update_layout(width=1200, height=700)
-    except Exception as e:
-        print(f"Error in save_chart_as_html: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        fig = _create_error_figure(str(e))
-        fig.update_layout(width=1200, height=700)
+    fig = _render_figure(chart_name, data_json, mappings, 1200, 700, 'save_chart_as_html')
+    
+    config = {'displayModeBar': True, 'displaylogo': False, 'modeBarButtonsToRemove': ['select2d', 'lasso2d'], 'responsive': True}
+    div_id = str(uuid.uuid4())
+    head = _HTML_PAGE_HEAD.format(
+        plotlyjs_version=get_plotlyjs_version(),
+        div_id=div_id,
+        width=fig.layout.width,
+        height=fig.layout.height
+    )
+    tail = _HTML_PAGE_TAIL.format(div_id=div_id, config=json.dumps(config))
     
-    config = {'displayModeBar': True, 'displaylogo': False, 'modeBarButtonsToRemove': ['select2d', 'lasso2d']}
-    fig.write_html(output_path, config=config, include_plotlyjs='cdn')
+    # Write the figure JSON straight to disk instead of building the whole page as one string
+    with open(output_path, 'wb') as f:
+        f.write(head.encode())
+        f.write(_figure_to_json_bytes(fig))
+        f.write(tail.encode())
     return output_path
 
 def create_temp_html_chart(chart_name: str, data_json: str, mappings: Dict[str, str]) -> str:
@@ -513,10 +685,7 @@ def open_chart_in_browser(chart_name: str, data_json: str, mappings: Dict[str, s
 
 def get_available_charts() -> list:
     """Returns a list of all available chart types."""
-    px_charts = [attr for attr in dir(px) if not attr.startswith('_') and callable(getattr(px, attr))]
-    special_charts = list(SPECIAL_CHART_HANDLERS.keys())
-    aliases = ['doughnut', 'bubble']
-    return sorted(set(px_charts + special_charts + aliases))
+    return list(_AVAILABLE_CHARTS)
 
 def validate_chart_mappings(chart_name: str, mappings: Dict[str, str], data: Dict) -> Dict[str, Any]:
     """Validates that the chart mappings are valid for the given data."""
@@ -540,8 +709,8 @@ def validate_chart_mappings(chart_name: str, mappings: Dict[str, str], data: Dic
                 warnings.append(f"Column '{col}' has {null_pct:.1f}% missing values")
             
             # Check for "na" string values
-            if col_data.dtype == 'object':
-                na_count = col_data.isin(['na', 'Na', 'NA', 'n/a', 'N/A', '', 'null', 'None']).sum()
+            if col_data.dtype == 'object' or isinstance(col_data.dtype, pd.StringDtype):
+                na_count = col_data.isin(_NA_SENTINELS).sum()
                 if na_count > 0:
                     warnings.append(f"Column '{col}' has {na_count} 'na' string values that will be cleaned")
     
@@ -584,7 +753,7 @@ def validate_chart_mappings(chart_name: str, mappings: Dict[str, str], data: Dic
             errors.append(f"{chart_name} requires at least one numeric column")
     
     elif chart_name == 'parallel_categories':
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        _, categorical_cols = _split_columns_by_dtype(df)
         if not categorical_cols:
             errors.append("Parallel categories requires at least one categorical column")
     
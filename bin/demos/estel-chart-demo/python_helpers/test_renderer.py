@@ -17,15 +17,33 @@ Comprehensive testing for all chart types and edge cases.
 """
 
 import json
+import os
 import sys
+import tempfile
 import time
 import traceback
-from typing import Dict, Any, List, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, Final, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib json module is used otherwise
+    orjson = None
+
+# Best-of-N repeats for the performance test, so one-off warm-up and GC pauses don't skew the timing
+_PERF_REPEATS = 5
+
+# Add current directory to path so the renderer imports when collected by pytest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import all functions from the main renderer module
+import renderer
 from renderer import (
     render_chart,
-    create_temp_html_chart,
+    save_chart_as_html,
     validate_chart_mappings,
     create_sample_data,
     get_available_charts,
@@ -34,202 +52,255 @@ from renderer import (
     _create_error_figure
 )
 
-def run_test(test_name: str, chart_name: str, data: Dict[str, Any], mappings: Dict[str, str]) -> bool:
-    """Run a single test case."""
-    print(f"\n--- {test_name} ---")
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for NumPy arrays the JSON encoder can't write directly."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize a test dataset to JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=_json_default).decode()
+    return json.dumps(data, default=_json_default)
+
+# Encoded payloads keyed by id() of the dataset; the dataset is kept alongside so its id can't be reused
+_PAYLOAD_CACHE: Dict[int, Tuple[Dict[str, Any], str]] = {}
+
+def _payload(data: Dict[str, Any]) -> str:
+    """JSON payload for a test dataset, encoded once per dataset object."""
+    entry = _PAYLOAD_CACHE.get(id(data))
+    if entry is None:
+        entry = _PAYLOAD_CACHE[id(data)] = (data, _dumps(data))
+    return entry[1]
+
+def _output_path(out_dir: str, test_name: str) -> str:
+    """Deterministic HTML output path for a test inside the suite's temp directory."""
+    return os.path.join(out_dir, f"{test_name.replace(' ', '_')}.html")
+
+def run_test(test_name: str, chart_name: str, data: Dict[str, Any], mappings: Dict[str, str], out_dir: str, payload: Optional[str] = None) -> Tuple[bool, List[str]]:
+    """Run a single test case, returning whether it passed and its output lines."""
+    output = [f"\n--- {test_name} ---"]
     try:
         validation = validate_chart_mappings(chart_name, mappings, data)
         if validation['errors']:
-            print(f"  Validation errors: {validation['errors']}")
-            return False
+            output.append(f"  Validation errors: {validation['errors']}")
+            return False, output
         if validation['warnings']:
-            print(f"  Validation warnings: {validation['warnings']}")
+            output.append(f"  Validation warnings: {validation['warnings']}")
 
-        html_path = create_temp_html_chart(chart_name, json.dumps(data), mappings)
-        print(f"  Success: {html_path}")
-        return True
+        if payload is None:
+            payload = _payload(data)
+        html_path = save_chart_as_html(chart_name, payload, mappings, _output_path(out_dir, test_name))
+        output.append(f"  Success: {html_path}")
+        return True, output
     except Exception as e:
-        print(f"  Failed: {e}")
-        return False
+        output.append(f"  Failed: {e}")
+        return False, output
+
+def _warm_worker() -> None:
+    """Pool initializer: render a tiny chart so Plotly's lazy imports and default template load before the first case."""
+    render_chart("scatter", _dumps({"x": [0, 1], "y": [0, 1]}), {"x": "x", "y": "y"})
+
+def _run_case(case: Tuple[str, str, Dict[str, Any], Dict[str, str], str], out_dir: str) -> Tuple[bool, List[str]]:
+    """Process pool entry point for run_test."""
+    test_name, chart_name, data, mappings, payload = case
+    return run_test(test_name, chart_name, data, mappings, out_dir, payload)
+
+def _run_error_case(case: Tuple[str, str, Dict[str, Any], Dict[str, str], str], out_dir: str) -> Tuple[bool, List[str]]:
+    """Run a single error handling case, returning whether it passed and its output lines."""
+    test_name, chart_name, data, mappings, payload = case
+    output = [f"\n--- {test_name} ---"]
+    try:
+        html_path = save_chart_as_html(chart_name, payload, mappings, _output_path(out_dir, test_name))
+        output.append(f"Error handling works: {html_path}")
+        return True, output
+    except Exception as e:
+        output.append(f"Error handling test failed: {e}")
+        return False, output
+
+def _run_validation_case(case: Tuple[str, Dict[str, Any], Dict[str, str]]) -> Tuple[bool, List[str]]:
+    """Run a single data validation case, returning whether it passed and its output lines."""
+    test_name, data, mappings = case
+    output = [f"\n--- {test_name} ---"]
+    try:
+        validation = validate_chart_mappings("scatter", mappings, data)
+        if validation['errors']:
+            output.append(f"  Validation errors: {validation['errors']}")
+            return False, output
+        output.append(f"  Validation passed")
+        if validation['warnings']:
+            output.append(f"  Warnings: {validation['warnings']}")
+        return True, output
+    except Exception as e:
+        output.append(f"  Validation failed: {e}")
+        return False, output
+
+def _with_payloads(cases: List[Tuple]) -> List[Tuple]:
+    """Append each case's encoded dataset, so datasets shared between cases are encoded once in the parent."""
+    return [(*case, _payload(case[2])) for case in cases]
+
+def _run_parallel(executor: Executor, fn, cases: List[Tuple]) -> Dict[str, int]:
+    """Run independent cases on the executor, then write their output in case order in one go."""
+    results = list(executor.map(fn, cases))
+    sys.stdout.write("\n".join(line for _, output in results for line in output) + "\n")
+
+    passed = sum(1 for ok, _ in results if ok)
+    failed = len(results) - passed
+    return {"passed": passed, "failed": failed, "total": passed + failed}
+
+# Test datasets and mappings are built once at import time; cases that share data share the same objects
+_SAMPLE_DATA: Final = {"x_axis": [1, 2, 3], "y_axis": [10, 15, 13], "category": ["A", "B", "A"]}
+_PROBLEMATIC_DATA: Final = {
+    "gross_mthly_75_percentile": ["4000", "2900", "3500", "4100", "na", "3365", "3800", "na"],
+    "school": ["School A", "School B", "School C", "School D", "School E", "School F", "School G", "School H"]
+}
+_NAMES_VALUES_DATA: Final = {"names": ["A", "B", "C"], "values": [10, 15, 13]}
+_CATEGORY_VALUES_DATA: Final = {"category": ["A", "A", "B", "B", "C", "C"], "values": [10, 12, 15, 18, 13, 16]}
+_VARIABLES_DATA: Final = {"var1": [1, 2, 3, 4, 5], "var2": [10, 20, 15, 25, 30], "var3": [5, 8, 12, 7, 9]}
+_SURFACE_DATA: Final = create_sample_data("surface")
+_CANDLESTICK_DATA: Final = create_sample_data("candlestick")
+_SANKEY_DATA: Final = create_sample_data("sankey")
+_INDICATOR_DATA: Final = create_sample_data("indicator")
+
+_HIERARCHY_MAPPINGS: Final = {"values": "gross_mthly_75_percentile", "names": "school"}
+_NAMES_VALUES_MAPPINGS: Final = {"names": "names", "values": "values"}
+_CATEGORY_VALUES_MAPPINGS: Final = {"x": "category", "y": "values"}
+
+_TEST_CASES: Final = (
+    ("Basic Scatter", "scatter", _SAMPLE_DATA, {"x": "x_axis", "y": "y_axis", "color": "category"}),
+    ("Basic Bar", "bar", {"categories": ["A", "B", "C"], "values": [10, 15, 13]}, {"x": "categories", "y": "values"}),
+    ("Problematic Treemap", "treemap", _PROBLEMATIC_DATA, _HIERARCHY_MAPPINGS),
+    ("Problematic Sunburst", "sunburst", _PROBLEMATIC_DATA, _HIERARCHY_MAPPINGS),
+    ("Animated Scatter", "scatter", {"x": [1, 2, 3, 4], "y": [10, 15, 13, 17], "frame": [0, 0, 1, 1]}, {"x": "x", "y": "y", "animation_frame": "frame"}),
+    ("Beyond Int64 Scatter", "scatter", {"id": [2**63, 2**63 + 1, 2**63 + 2], "y_axis": [10, 15, 13]}, {"x": "id", "y": "y_axis"}),
+    ("Line Chart", "line", _SAMPLE_DATA, {"x": "x_axis", "y": "y_axis"}),
+    ("Pie Chart", "pie", _NAMES_VALUES_DATA, _NAMES_VALUES_MAPPINGS),
+    ("Doughnut Chart", "doughnut", _NAMES_VALUES_DATA, _NAMES_VALUES_MAPPINGS),
+    ("Histogram", "histogram", _SAMPLE_DATA, {"x": "y_axis"}),
+    ("Box Plot", "box", _CATEGORY_VALUES_DATA, _CATEGORY_VALUES_MAPPINGS),
+    ("Violin Plot", "violin", _CATEGORY_VALUES_DATA, _CATEGORY_VALUES_MAPPINGS),
+    ("Surface Plot", "surface", _SURFACE_DATA, {"x": "x", "y": "y", "z": "z"}),
+    ("Candlestick", "candlestick", _CANDLESTICK_DATA, {"x": "date", "open": "open", "high": "high", "low": "low", "close": "close"}),
+    ("Sankey", "sankey", _SANKEY_DATA, {"source": "source", "target": "target", "value": "value"}),
+    ("Indicator", "indicator", _INDICATOR_DATA, {"value": "metric"}),
+    ("Waterfall", "waterfall", {"x": ["Start", "Q1", "Q2", "Q3", "Q4"], "y": [100, 20, -10, 15, -5], "measure": ["absolute", "relative", "relative", "relative", "relative"]}, {"x": "x", "y": "y", "measure": "measure"}),
+    ("Scatter Matrix", "scatter_matrix", _VARIABLES_DATA, {}),
+    ("Parallel Categories", "parallel_categories", {"cat1": ["A", "B", "A", "B", "A"], "cat2": ["X", "Y", "X", "Y", "X"], "cat3": ["1", "2", "1", "2", "1"]}, {}),
+    ("Parallel Coordinates", "parallel_coordinates", _VARIABLES_DATA, {}),
+)
+
+_ERROR_CASES: Final = (
+    ("Invalid Chart Type", "invalid_chart", {"x": [1, 2, 3], "y": [10, 15, 13]}, {"x": "x", "y": "y"}),
+    ("Missing Column", "scatter", {"x": [1, 2, 3], "y": [10, 15, 13]}, {"x": "missing_column", "y": "y"}),
+    ("Empty Dataset", "scatter", {}, {"x": "x", "y": "y"}),
+    ("All NA Values", "scatter", {"x": ["na", "na", "na"], "y": ["na", "na", "na"]}, {"x": "x", "y": "y"}),
+)
+
+_VALIDATION_CASES: Final = (
+    ("Clean Data", {"x": [1, 2, 3], "y": [10, 15, 13]}, {"x": "x", "y": "y"}),
+    ("String Numbers", {"x": ["1", "2", "3"], "y": ["10", "15", "13"]}, {"x": "x", "y": "y"}),
+    ("Mixed with NA", {"x": [1, "na", 3], "y": [10, 15, "N/A"]}, {"x": "x", "y": "y"}),
+    ("Currency Format", {"x": ["$100", "$200", "$150"], "y": ["10%", "15%", "13%"]}, {"x": "x", "y": "y"}),
+)
 
 def get_test_cases() -> List[Tuple[str, str, Dict[str, Any], Dict[str, str]]]:
     """Get all test cases."""
-    sample_data = {"x_axis": [1, 2, 3], "y_axis": [10, 15, 13], "category": ["A", "B", "A"]}
-    problematic_data = {
-        "gross_mthly_75_percentile": ["4000", "2900", "3500", "4100", "na", "3365", "3800", "na"],
-        "school": ["School A", "School B", "School C", "School D", "School E", "School F", "School G", "School H"]
-    }
+    return list(_TEST_CASES)
 
-    return [
-        ("Basic Scatter", "scatter", sample_data, {"x": "x_axis", "y": "y_axis", "color": "category"}),
-        ("Basic Bar", "bar", {"categories": ["A", "B", "C"], "values": [10, 15, 13]}, {"x": "categories", "y": "values"}),
-        ("Problematic Treemap", "treemap", problematic_data, {"values": "gross_mthly_75_percentile", "names": "school"}),
-        ("Problematic Sunburst", "sunburst", problematic_data, {"values": "gross_mthly_75_percentile", "names": "school"}),
-        ("Line Chart", "line", sample_data, {"x": "x_axis", "y": "y_axis"}),
-        ("Pie Chart", "pie", {"names": ["A", "B", "C"], "values": [10, 15, 13]}, {"names": "names", "values": "values"}),
-        ("Doughnut Chart", "doughnut", {"names": ["A", "B", "C"], "values": [10, 15, 13]}, {"names": "names", "values": "values"}),
-        ("Histogram", "histogram", sample_data, {"x": "y_axis"}),
-        ("Box Plot", "box", {"category": ["A", "A", "B", "B", "C", "C"], "values": [10, 12, 15, 18, 13, 16]}, {"x": "category", "y": "values"}),
-        ("Violin Plot", "violin", {"category": ["A", "A", "B", "B", "C", "C"], "values": [10, 12, 15, 18, 13, 16]}, {"x": "category", "y": "values"}),
-        ("Surface Plot", "surface", create_sample_data("surface"), {"x": "x", "y": "y", "z": "z"}),
-        ("Candlestick", "candlestick", create_sample_data("candlestick"), {"x": "date", "open": "open", "high": "high", "low": "low", "close": "close"}),
-        ("Sankey", "sankey", create_sample_data("sankey"), {"source": "source", "target": "target", "value": "value"}),
-        ("Indicator", "indicator", create_sample_data("indicator"), {"value": "metric"}),
-        ("Waterfall", "waterfall", {"x": ["Start", "Q1", "Q2", "Q3", "Q4"], "y": [100, 20, -10, 15, -5], "measure": ["absolute", "relative", "relative", "relative", "relative"]}, {"x": "x", "y": "y", "measure": "measure"}),
-        ("Scatter Matrix", "scatter_matrix", {"var1": [1, 2, 3, 4, 5], "var2": [10, 20, 15, 25, 30], "var3": [5, 8, 12, 7, 9]}, {}),
-        ("Parallel Categories", "parallel_categories", {"cat1": ["A", "B", "A", "B", "A"], "cat2": ["X", "Y", "X", "Y", "X"], "cat3": ["1", "2", "1", "2", "1"]}, {}),
-        ("Parallel Coordinates", "parallel_coordinates", {"var1": [1, 2, 3, 4, 5], "var2": [10, 20, 15, 25, 30], "var3": [5, 8, 12, 7, 9]}, {}),
-    ]
-
-def run_basic_tests():
+def run_basic_tests(executor: Executor, out_dir: str):
     """Run all basic chart tests."""
     print("=== Running Basic Chart Tests ===")
 
-    test_cases = get_test_cases()
-    passed = 0
-    failed = 0
-
-    for test_name, chart_name, data, mappings in test_cases:
-        if run_test(test_name, chart_name, data, mappings):
-            passed += 1
-        else:
-            failed += 1
+    results = _run_parallel(executor, partial(_run_case, out_dir=out_dir), _with_payloads(get_test_cases()))
 
     print(f"\n=== Basic Test Summary ===")
-    print(f"Passed: {passed}")
-    print(f"Failed: {failed}")
-    print(f"Total: {passed + failed}")
+    print(f"Passed: {results['passed']}")
+    print(f"Failed: {results['failed']}")
+    print(f"Total: {results['total']}")
 
-    return {"passed": passed, "failed": failed, "total": passed + failed}
+    return results
 
-def run_performance_tests():
+def run_performance_tests(out_dir: str):
     """Run performance tests with larger datasets."""
     print(f"\n=== Performance Tests ===")
 
+    x = np.arange(1000)
+    category_labels = np.array([f"Cat_{i}" for i in range(5)])
     large_data = {
-        "x": list(range(1000)),
-        "y": [i * 2 + (i % 10) for i in range(1000)],
-        "category": [f"Cat_{i % 5}" for i in range(1000)]
+        "x": x,
+        "y": x * 2 + (x % 10),
+        "category": category_labels[x % 5]
     }
 
-    start_time = time.time()
-
     try:
-        html_path = create_temp_html_chart("scatter", json.dumps(large_data), {"x": "x", "y": "y", "color": "category"})
-        end_time = time.time()
-        print(f"Large dataset (1000 points) rendered in {end_time - start_time:.2f} seconds")
+        timings = []
+        for _ in range(_PERF_REPEATS):
+            # Drop parsed payloads so every repeat pays for JSON parsing and DataFrame construction
+            renderer._dataframe_cache.clear()
+            start_ns = time.perf_counter_ns()
+            html_path = save_chart_as_html("scatter", _dumps(large_data), {"x": "x", "y": "y", "color": "category"}, _output_path(out_dir, "Large Dataset"))
+            timings.append(time.perf_counter_ns() - start_ns)
+        print(f"Large dataset (1000 points) rendered in {min(timings) / 1e9:.4f} seconds (best of {_PERF_REPEATS})")
         print(f"File: {html_path}")
         return True
     except Exception as e:
         print(f"Performance test failed: {e}")
         return False
 
-def run_error_handling_tests():
+def run_error_handling_tests(executor: Executor, out_dir: str):
     """Test error handling capabilities."""
     print(f"\n=== Error Handling Tests ===")
 
-    test_cases = [
-        ("Invalid Chart Type", "invalid_chart", {"x": [1, 2, 3], "y": [10, 15, 13]}, {"x": "x", "y": "y"}),
-        ("Missing Column", "scatter", {"x": [1, 2, 3], "y": [10, 15, 13]}, {"x": "missing_column", "y": "y"}),
-        ("Empty Dataset", "scatter", {}, {"x": "x", "y": "y"}),
-        ("All NA Values", "scatter", {"x": ["na", "na", "na"], "y": ["na", "na", "na"]}, {"x": "x", "y": "y"}),
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test_name, chart_name, data, mappings in test_cases:
-        print(f"\n--- {test_name} ---")
-        try:
-            html_path = create_temp_html_chart(chart_name, json.dumps(data), mappings)
-            print(f"Error handling works: {html_path}")
-            passed += 1
-        except Exception as e:
-            print(f"Error handling test failed: {e}")
-            failed += 1
-
-    return {"passed": passed, "failed": failed, "total": passed + failed}
+    return _run_parallel(executor, partial(_run_error_case, out_dir=out_dir), _with_payloads(list(_ERROR_CASES)))
 
 def run_chart_availability_tests():
     """Test chart availability and metadata."""
     print(f"\n=== Chart Availability Tests ===")
 
-    available_charts = get_available_charts()
+    available_charts = set(get_available_charts())
     print(f"Total available charts: {len(available_charts)}")
 
     # Group by type for better organisation
     try:
         import plotly.express as px
-        px_charts = [attr for attr in dir(px) if not attr.startswith('_') and callable(getattr(px, attr))]
+        px_charts = {attr for attr in dir(px) if not attr.startswith('_') and callable(getattr(px, attr))}
 
-        print("\nPlotly Express Charts:")
+        output = ["\nPlotly Express Charts:"]
         for chart in sorted(px_charts):
             if chart in available_charts:
-                print(f"  {chart}")
+                output.append(f"  {chart}")
             else:
-                print(f"  {chart} (not in available list)")
+                output.append(f"  {chart} (not in available list)")
 
-        print("\nSpecial Handler Charts:")
-        special_charts = [chart for chart in available_charts if chart not in px_charts]
-        for chart in sorted(special_charts):
-            print(f"  {chart}")
+        output.append("\nSpecial Handler Charts:")
+        output.extend(f"  {chart}" for chart in sorted(available_charts - px_charts))
+        sys.stdout.write("\n".join(output) + "\n")
 
         return True
     except Exception as e:
         print(f"Chart availability test failed: {e}")
         return False
 
-def run_data_validation_tests():
+def run_data_validation_tests(executor: Executor):
     """Test data validation and cleaning."""
     print(f"\n=== Data Validation Tests ===")
 
-    test_datasets = [
-        ("Clean Data", {"x": [1, 2, 3], "y": [10, 15, 13]}, {"x": "x", "y": "y"}),
-        ("String Numbers", {"x": ["1", "2", "3"], "y": ["10", "15", "13"]}, {"x": "x", "y": "y"}),
-        ("Mixed with NA", {"x": [1, "na", 3], "y": [10, 15, "N/A"]}, {"x": "x", "y": "y"}),
-        ("Currency Format", {"x": ["$100", "$200", "$150"], "y": ["10%", "15%", "13%"]}, {"x": "x", "y": "y"}),
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test_name, data, mappings in test_datasets:
-        print(f"\n--- {test_name} ---")
-        try:
-            validation = validate_chart_mappings("scatter", mappings, data)
-            if validation['errors']:
-                print(f"  Validation errors: {validation['errors']}")
-                failed += 1
-            else:
-                print(f"  Validation passed")
-                if validation['warnings']:
-                    print(f"  Warnings: {validation['warnings']}")
-                passed += 1
-        except Exception as e:
-            print(f"  Validation failed: {e}")
-            failed += 1
-
-    return {"passed": passed, "failed": failed, "total": passed + failed}
-
-def print_cleanup_info():
-    """Print cleanup information for temporary files."""
-    print(f"\n=== Cleanup Information ===")
-    print("Note: Temporary HTML files are created in the system temp directory.")
-    print("To clean up: Check your system's temp folder and remove files matching '*_chart_name.html'")
-    print("On Unix systems: ls /tmp/*_*.html")
-    print("On Windows: dir %TEMP%\\*_*.html")
+    return _run_parallel(executor, _run_validation_case, list(_VALIDATION_CASES))
 
 def main():
     """Run all tests."""
     try:
         print("=== Chart Renderer Test Suite ===")
 
-        # Run all test suites
-        basic_results = run_basic_tests()
-        performance_ok = run_performance_tests()
-        error_results = run_error_handling_tests()
-        availability_ok = run_chart_availability_tests()
-        validation_results = run_data_validation_tests()
+        # Run all test suites; independent cases are spread across one warmed pool of worker processes
+        # Charts are written to one temp directory that is removed when the suite finishes
+        with tempfile.TemporaryDirectory() as out_dir, ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(_TEST_CASES)), initializer=_warm_worker) as executor:
+            basic_results = run_basic_tests(executor, out_dir)
+            performance_ok = run_performance_tests(out_dir)
+            error_results = run_error_handling_tests(executor, out_dir)
+            availability_ok = run_chart_availability_tests()
+            validation_results = run_data_validation_tests(executor)
 
         # Print overall summary
         print(f"\n=== Overall Test Summary ===")
@@ -248,8 +319,6 @@ def main():
         else:
             print(f"\n{total_failed} tests failed. Check the logs above for details.")
 
-        print_cleanup_info()
-
         return total_failed == 0
 
     except Exception as e:
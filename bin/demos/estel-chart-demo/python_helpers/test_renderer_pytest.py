@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: AGPL-3.0-only
+# Copyright (C) 2024 Jonathan Lee
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3
+# as published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""
+Pytest entry point for the chart renderer test cases.
+Runs the cases from test_renderer.py as individual parametrized tests.
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from renderer import render_chart, save_chart_as_html, validate_chart_mappings
+from test_renderer import (
+    run_test,
+    get_test_cases,
+    run_performance_tests,
+    run_chart_availability_tests,
+    _run_error_case,
+    _run_validation_case,
+    _payload,
+    _ERROR_CASES,
+    _VALIDATION_CASES
+)
+
+# Error cases the renderer reports through its error figure rather than a chart
+_ERROR_FIGURE_CASES = {"Invalid Chart Type", "Missing Column", "Empty Dataset"}
+
+def _case_ids(cases):
+    return [case[0] for case in cases]
+
+def _render_layout(chart_name, data, mappings):
+    # Rendering failures don't raise; they come back as a figure annotated with the error
+    figure = json.loads(render_chart(chart_name, _payload(data), dict(mappings)))
+    return json.dumps(figure["layout"])
+
+@pytest.mark.parametrize("test_name,chart_name,data,mappings", get_test_cases(), ids=_case_ids(get_test_cases()))
+def test_chart(test_name, chart_name, data, mappings, tmp_path):
+    ok, output = run_test(test_name, chart_name, data, mappings, str(tmp_path))
+    assert ok, "\n".join(output)
+    layout = _render_layout(chart_name, data, mappings)
+    assert "Chart Rendering Error" not in layout, layout
+
+@pytest.mark.parametrize("case", _ERROR_CASES, ids=_case_ids(_ERROR_CASES))
+def test_error_handling(case, tmp_path):
+    ok, output = _run_error_case((*case, _payload(case[2])), str(tmp_path))
+    assert ok, "\n".join(output)
+    test_name, chart_name, data, mappings = case
+    assert ("Chart Rendering Error" in _render_layout(chart_name, data, mappings)) == (test_name in _ERROR_FIGURE_CASES)
+
+@pytest.mark.parametrize("case", _VALIDATION_CASES, ids=_case_ids(_VALIDATION_CASES))
+def test_data_validation(case):
+    ok, output = _run_validation_case(case)
+    assert ok, "\n".join(output)
+
+def test_animated_chart_html_adds_frames(tmp_path):
+    data = {"x": [1, 2, 3, 4], "y": [10, 15, 13, 17], "frame": [0, 0, 1, 1]}
+    html_path = save_chart_as_html("scatter", _payload(data), {"x": "x", "y": "y", "animation_frame": "frame"}, str(tmp_path / "animated.html"))
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+    assert '"frames":' in html
+    assert "Plotly.addFrames(" in html
+    assert '"responsive": true' in html
+
+def test_json_with_nan_renders():
+    # json.dumps writes missing floats as bare NaN tokens, which orjson alone rejects
+    figure = json.loads(render_chart("scatter", json.dumps({"x": [1, 2, 3], "y": [1.0, float("nan"), 3.0]}), {"x": "x", "y": "y"}))
+    assert "Chart Rendering Error" not in json.dumps(figure["layout"])
+    assert figure["data"][0]["type"] == "scatter"
+
+@pytest.mark.parametrize("chart_name", ["scatter_matrix", "parallel_coordinates"])
+def test_bool_only_data_is_not_numeric(chart_name):
+    # The handlers skip bool columns, so validation must not count them as numeric either
+    validation = validate_chart_mappings(chart_name, {}, {"a": [True, False, True], "b": [False, False, True]})
+    assert not validation["valid"]
+
+def test_performance(tmp_path):
+    assert run_performance_tests(str(tmp_path))
+
+def test_chart_availability():
+    assert run_chart_availability_tests()
+
+if __name__ == "__main__":
+    args = [__file__]
+    try:
+        import xdist  # noqa: F401
+        args += ["-n", "auto"]
+    except ImportError:  # Optional; without pytest-xdist the cases run serially
+        pass
+    sys.exit(pytest.main(args))
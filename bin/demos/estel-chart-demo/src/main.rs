@@ -387,7 +387,7 @@ for p in candidate_paths:
     if os.path.isdir(p) and p not in sys.path:
         sys.path.insert(0, p)
 
-from renderer import render_chart
+from renderer import render_chart_bytes
 
 data_json = r'''{data_json}'''
 
@@ -398,8 +398,8 @@ mappings_json = r'''{mappings_json}'''
 mappings = json.loads(mappings_json)
 
 try:
-    result = render_chart('{chart}', json.dumps(data), mappings)
-    print(result)
+    result = render_chart_bytes('{chart}', json.dumps(data), mappings)
+    sys.stdout.buffer.write(result + b"\n")
 except Exception as e:
     import traceback
     traceback.print_exc(file=sys.stderr);